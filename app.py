@@ -2,10 +2,13 @@
 # Locked defaults + Insight Cards tailored to the classic insurance dataset
 # Columns expected (if present): age, sex, bmi, children, smoker, region, charges
 
+import hashlib
 import io
+from pathlib import Path
 import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
 st.set_page_config(page_title="HCD Interactive App", page_icon="✨", layout="wide")
@@ -24,10 +27,16 @@ st.caption("Upload any CSV. Categorical columns become filters; numeric columns
 
 uploaded = st.file_uploader("Upload a CSV file", type=["csv"], help="Headers required on the first row.")
 
-@st.cache_data(show_spinner=False)
 def load_csv(file_bytes: bytes | None) -> pd.DataFrame:
     if file_bytes:
-        df = pd.read_csv(io.BytesIO(file_bytes))
+        # Multithreaded Arrow parser; fall back to the default engine for files it rejects and for
+        # duplicate/empty headers, which only the C engine renames ("val.1", "Unnamed: 0")
+        try:
+            df = pd.read_csv(io.BytesIO(file_bytes), engine="pyarrow")
+        except Exception:
+            df = None
+        if df is None or df.columns.duplicated().any() or any(str(c) == "" for c in df.columns):
+            df = pd.read_csv(io.BytesIO(file_bytes))
     else:
         # Tiny fallback demo
         rng = np.random.default_rng(7)
@@ -44,9 +53,153 @@ def load_csv(file_bytes: bytes | None) -> pd.DataFrame:
                 df[c] = pd.to_datetime(df[c])
             except Exception:
                 pass
+    # Text columns -> categorical once, so filters compare small integer codes
+    for c in df.select_dtypes(include=["object", "string"]).columns:
+        df[c] = df[c].astype("category")
+    return df
+
+# Parsed uploads are also kept on disk so app restarts skip CSV parsing
+CACHE_DIR = Path.home() / ".cache" / "hcd"
+# Bump whenever load_csv's output changes (parsing, date coercion, dtype conversion) so stale files are ignored
+LOADER_VERSION = 1
+# Most recently used parsed files kept on disk; older ones are pruned
+CACHE_MAX_FILES = 20
+
+def _prune_cache() -> None:
+    files = sorted(CACHE_DIR.glob("*.parquet"), key=lambda f: f.stat().st_mtime, reverse=True)
+    for f in files[CACHE_MAX_FILES:]:
+        f.unlink(missing_ok=True)
+
+@st.cache_data(show_spinner=False)
+def _load_by_digest(digest: str, _file_bytes: bytes | None) -> pd.DataFrame:
+    # Cache keyed by a precomputed digest; the raw bytes (leading underscore) are never hashed by Streamlit
+    if not _file_bytes:
+        return load_csv(None)
+    path = CACHE_DIR / f"{digest}-v{LOADER_VERSION}.parquet"
+    if path.exists():
+        try:
+            df = pd.read_parquet(path)
+            path.touch()  # mark as recently used for pruning
+            return df
+        except Exception:
+            pass
+    df = load_csv(_file_bytes)
+    # Best effort: a read-only or full disk just means no persistent cache
+    tmp = path.with_suffix(".tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(tmp, compression="zstd")
+        tmp.replace(path)
+        _prune_cache()
+    except Exception:
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
     return df
 
-df = load_csv(uploaded.getvalue() if uploaded else None)
+# Filter label for rows with no value in the chosen category column
+MISSING = "(missing)"
+
+def _cat_mask(s: pd.Series, values, lower: bool = False) -> np.ndarray:
+    # Membership mask by label; categorical columns are matched on their integer codes
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        labels = s.cat.categories.astype(str)
+        if lower:
+            labels = labels.str.lower()
+        sel_codes = np.flatnonzero(labels.isin(values))
+        if MISSING in values:
+            sel_codes = np.append(sel_codes, -1)  # missing values carry code -1
+        return np.isin(s.cat.codes.to_numpy(), sel_codes.astype(s.cat.codes.dtype))
+    labels = s.astype(str)
+    if lower:
+        labels = labels.str.lower()
+    mask = labels.isin(values).to_numpy(copy=True)  # writable: updated in place below
+    if MISSING in values:
+        mask |= s.isna().to_numpy()
+    return mask
+
+def _idx(choices: list, default, fallback: int = 0) -> int:
+    # Selectbox index of default in one pass over choices (fallback when absent)
+    return {c: i for i, c in enumerate(choices)}.get(default, fallback)
+
+@st.cache_data(show_spinner=False)
+def _schema(_df: pd.DataFrame, digest: str) -> dict:
+    return dict(
+        num_cols=_df.select_dtypes(include=["number"]).columns.tolist(),
+        cat_cols=_df.select_dtypes(include=["object","category","bool"]).columns.tolist(),
+        date_cols=[c for c in _df.columns if ("date" in c.lower()) or pd.api.types.is_datetime64_any_dtype(_df[c])],
+    )
+
+@st.cache_data(show_spinner=False)
+def _defaults(_df: pd.DataFrame, digest: str, num_cols: list, cat_cols: list) -> dict:
+    # Category column (default -> smoker, else region, else sex, else first categorical)
+    cat_col_default_candidates = ["smoker", "region", "sex", "category", "city"]
+    # Numeric column (default -> charges, else bmi, else first numeric)
+    num_default_candidates = ["charges", "bmi", "value", "cost"]
+    default_x = "bmi" if "bmi" in num_cols else (num_cols[0] if num_cols else None)
+    default_y = "charges" if "charges" in num_cols else (num_cols[1] if len(num_cols) > 1 else default_x)
+    cols = frozenset(_df.columns)
+    return dict(
+        default_cat=next((c for c in cat_col_default_candidates if c in cols), None),
+        default_num=next((c for c in num_default_candidates if c in cols and _df[c].dtype.kind in "if"), None),
+        default_x=default_x,
+        default_y=default_y,
+    )
+
+@st.cache_data(show_spinner=False)
+def _col_stats(_df: pd.DataFrame, digest: str, num_cols: list, cat_cols: list) -> dict:
+    # Per-column summaries for the filter widgets, computed once per dataset
+    minmax, q5_q95 = {}, {}
+    for c in num_cols:
+        arr = _df[c].to_numpy()
+        if not _df[c].notna().any():
+            continue  # no values to range over (e.g. a header-only CSV); not offered as a range filter
+        if c == "charges":
+            # Bounds and the trimmed default range from a single percentile pass
+            lo, q5, q95, hi = map(float, np.nanpercentile(arr, [0, 5, 95, 100]))
+            q5_q95[c] = (q5, q95)
+        else:
+            lo, hi = float(np.nanmin(arr)), float(np.nanmax(arr))
+        minmax[c] = (lo, hi)
+    return {
+        # Missing values get an explicit, selectable option so the default (all selected) keeps every row
+        "unique_cats": {
+            c: sorted(_df[c].dropna().astype(str).unique().tolist()) + ([MISSING] if _df[c].isna().any() else [])
+            for c in cat_cols
+        },
+        "minmax": minmax,
+        "q5_q95": q5_q95,
+    }
+
+# Low-cardinality categoricals get one packed bitmap per category code for fast filter masks
+BITMAP_MAX_LABELS = 32
+
+@st.cache_data(show_spinner=False)
+def _bitmaps(_df: pd.DataFrame, digest: str, cat_cols: list) -> dict:
+    # col -> (labels, bits): bits[code] is the packed row mask for that code; the last row is missing values
+    bitmaps = {}
+    for c in cat_cols:
+        s = _df[c]
+        if not isinstance(s.dtype, pd.CategoricalDtype) or len(s.cat.categories) > BITMAP_MAX_LABELS:
+            continue
+        codes = s.cat.codes.to_numpy()
+        k = len(s.cat.categories)
+        bits = np.stack([np.packbits(codes == code) for code in range(k)] + [np.packbits(codes < 0)])
+        bitmaps[c] = (s.cat.categories.astype(str).tolist(), bits)
+    return bitmaps
+
+def _bitmap_mask(labels: list, bits: np.ndarray, values, n: int) -> np.ndarray:
+    # Resolve selected labels to codes (every code whose label matches), OR their bitmaps, unpack once
+    selected = set(values)
+    rows = [i for i, label in enumerate(labels) if label in selected]
+    if MISSING in selected:
+        rows.append(len(labels))
+    return np.unpackbits(np.bitwise_or.reduce(bits[rows], axis=0), count=n).view(bool)
+
+file_bytes = uploaded.getvalue() if uploaded else None
+digest = hashlib.blake2b(file_bytes, digest_size=16).hexdigest() if file_bytes else "demo"
+df = _load_by_digest(digest, file_bytes)
 
 # Preview & schema
 left, right = st.columns([2, 1])
@@ -57,10 +210,14 @@ with right:
     st.subheader("Schema")
     st.write({"rows": int(len(df)), "columns": list(df.columns)})
 
-# Identify types
-num_cols = df.select_dtypes(include=["number"]).columns.tolist()
-cat_cols = df.select_dtypes(include=["object","category","bool"]).columns.tolist()
-maybe_date_cols = [c for c in df.columns if ("date" in c.lower()) or (np.issubdtype(df[c].dtype, np.datetime64))]
+# Identify types (cached per dataset; Streamlit reruns this script on every widget change)
+schema = _schema(df, digest)
+num_cols, cat_cols, maybe_date_cols = schema["num_cols"], schema["cat_cols"], schema["date_cols"]
+defaults = _defaults(df, digest, num_cols, cat_cols)
+col_stats = _col_stats(df, digest, num_cols, cat_cols)
+# Hash sets for the many membership checks below (Index/list lookups are linear scans)
+COLS, NUM_SET, CAT_SET = frozenset(df.columns), frozenset(num_cols), frozenset(cat_cols)
+bitmaps = _bitmaps(df, digest, cat_cols)
 
 # -------------------------
 # Interactive filters (locked sensible defaults for insurance.csv)
@@ -70,13 +227,11 @@ st.header("2) Explore (filters)")
 with st.container():
     st.markdown("Pick **one** category to filter and a **numeric** range to focus the view.")
 
-    # Category column (default -> smoker, else region, else sex, else first categorical)
-    cat_col_default_candidates = ["smoker", "region", "sex", "category", "city"]
-    default_cat = next((c for c in cat_col_default_candidates if c in df.columns), None)
+    default_cat = defaults["default_cat"]
 
     if len(cat_cols) > 0:
         cat_choices = ["(none)"] + cat_cols
-        cat_index = cat_choices.index(default_cat) if (default_cat in cat_cols) else 0
+        cat_index = _idx(cat_choices, default_cat)
         cat_col = st.selectbox("Categorical column (optional)", cat_choices, index=cat_index)
         if cat_col == "(none)":
             cat_col = None
@@ -86,23 +241,20 @@ with st.container():
     # Category values default to ALL (clear mental model, no hidden filter)
     sel_categories = None
     if cat_col is not None:
-        cat_values = sorted(pd.Series(df[cat_col].astype(str)).dropna().unique().tolist())
+        cat_values = col_stats["unique_cats"][cat_col]
         sel_categories = st.multiselect("Values", cat_values, default=cat_values)
 
-    # Numeric column (default -> charges, else bmi, else first numeric)
-    num_default_candidates = ["charges", "bmi", "value", "cost"]
-    default_num = next((c for c in num_default_candidates if c in df.columns and df[c].dtype.kind in "if"), None)
+    default_num = defaults["default_num"]
 
     if len(num_cols) > 0:
-        num_choices = ["(none)"] + num_cols
-        num_index = num_choices.index(default_num) if (default_num in num_cols) else 0
+        num_choices = ["(none)"] + [c for c in num_cols if c in col_stats["minmax"]]
+        num_index = _idx(num_choices, default_num)
         chosen_num = st.selectbox("Numeric column (for range filter, optional)", num_choices, index=num_index)
         if chosen_num != "(none)":
-            lo, hi = float(np.nanmin(df[chosen_num])), float(np.nanmax(df[chosen_num]))
+            lo, hi = col_stats["minmax"][chosen_num]
             # Slightly trimmed range for nicer defaults if charges has big outliers
             if chosen_num == "charges":
-                q5, q95 = np.nanpercentile(df[chosen_num], [5, 95])
-                default_range = (float(q5), float(q95))
+                default_range = col_stats["q5_q95"][chosen_num]
             else:
                 default_range = (lo, hi)
             num_range = st.slider("Range", min_value=lo, max_value=hi, value=default_range)
@@ -111,13 +263,21 @@ with st.container():
     else:
         chosen_num, num_range = None, None
 
-# Apply filters
-filt_df = df.copy()
-if cat_col is not None and sel_categories is not None and len(sel_categories) > 0:
-    filt_df = filt_df[filt_df[cat_col].astype(str).isin(sel_categories)]
+# Apply filters (one composed mask, one selection — no intermediate frames)
+mask = np.ones(len(df), dtype=bool)
+# Every value selected (the default) is no filter at all, so skip the mask
+if cat_col is not None and sel_categories is not None and 0 < len(sel_categories) < len(cat_values):
+    if cat_col in bitmaps:
+        mask &= _bitmap_mask(*bitmaps[cat_col], sel_categories, len(df))
+    else:
+        mask &= _cat_mask(df[cat_col], sel_categories)
 if chosen_num is not None and num_range is not None:
     lo, hi = num_range
-    filt_df = filt_df[(filt_df[chosen_num] >= lo) & (filt_df[chosen_num] <= hi)]
+    col = df[chosen_num].to_numpy()
+    mask &= (col >= lo) & (col <= hi)
+filt_df = df.loc[mask]
+# Identifies the filtered view for cached helpers, so they never hash filt_df itself
+view_key = (digest, cat_col, tuple(sel_categories or ()), chosen_num, num_range)
 
 st.success(f"Filtered rows: {len(filt_df):,} (of {len(df):,})")
 
@@ -137,37 +297,135 @@ chart_type = st.radio(
     ],
 )
 
-# Helper for aggregator
-AGGS = {"sum": np.nansum, "mean": np.nanmean, "median": np.nanmedian, "count": lambda x: np.sum(pd.notna(x))}
+# Scatter/line traces render via WebGL so large uploads stay responsive.
+# Switch to "svg" (or "auto") for browsers/environments without WebGL support.
+RENDER_MODE = "webgl"
+# Cap on points shipped to the browser per chart; larger selections are downsampled
+MAX_POINTS = 20_000
+
+@st.cache_data(show_spinner=False)
+def _downsample(_df: pd.DataFrame, view_key: tuple, n: int = MAX_POINTS) -> pd.DataFrame:
+    return _df if len(_df) <= n else _df.sample(n, random_state=0)
+
+@st.cache_data(show_spinner=False)
+def _box_stats(_df: pd.DataFrame, view_key: tuple, cat: str, val: str, n: int = MAX_POINTS) -> tuple[pd.DataFrame, pd.DataFrame, int]:
+    # Box statistics from every filtered row (so quartiles are exact), plus at most n of the outliers
+    # beyond the 1.5×IQR whiskers; returns (per-group stats, outlier points, total outlier count)
+    data = _df[[cat, val]].dropna()
+    g = data.groupby(cat, observed=True)[val]
+    q1, q3 = g.transform("quantile", 0.25), g.transform("quantile", 0.75)
+    iqr = q3 - q1
+    inside = data[val].between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+    whiskers = data[val].where(inside).groupby(data[cat], observed=True)
+    stats = pd.DataFrame({
+        "q1": g.quantile(0.25), "median": g.median(), "q3": g.quantile(0.75),
+        "lowerfence": whiskers.min(), "upperfence": whiskers.max(),
+    }).reset_index()
+    outliers = data[~inside]
+    n_outliers = len(outliers)
+    if n_outliers > n:
+        outliers = outliers.sample(n, random_state=0)
+    return stats, outliers, n_outliers
+
+@st.cache_data(show_spinner=False)
+def _lttb(_df: pd.DataFrame, view_key: tuple, x: str, y: str, n: int = MAX_POINTS) -> pd.DataFrame:
+    # Largest-Triangle-Three-Buckets on a frame already sorted by x: keeps the line's shape with n points
+    if len(_df) <= n:
+        return _df
+    _df = _df.dropna(subset=[x, y])
+    N = len(_df)
+    if N <= n:
+        return _df
+    xv = _df[x]
+    if pd.api.types.is_datetime64_any_dtype(xv):
+        xs = xv.to_numpy().astype("datetime64[ns]").astype(np.int64).astype(float)
+    elif pd.api.types.is_numeric_dtype(xv):
+        xs = xv.to_numpy(dtype=float)
+    else:
+        xs = np.arange(N, dtype=float)
+    ys = _df[y].to_numpy(dtype=float)
+    # n - 2 buckets over the interior points; first and last points are always kept
+    edges = np.linspace(1, N - 1, n - 1).astype(int)
+    keep, a = [0], 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        nstart, nend = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (N - 1, N)
+        avg_x, avg_y = xs[nstart:nend].mean(), ys[nstart:nend].mean()
+        area = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(np.argmax(area))
+        keep.append(a)
+    keep.append(N - 1)
+    return _df.iloc[keep]
+
+@st.cache_data(show_spinner=False)
+def _sort_order(_df: pd.DataFrame, digest: str, col: str) -> np.ndarray:
+    # Stable row positions of the full dataset ordered by col; filtering preserves this order
+    return _df[col].reset_index(drop=True).sort_values(kind="mergesort").index.to_numpy()
+
+def _sample_note(shown: pd.DataFrame, total: pd.DataFrame) -> None:
+    if len(shown) < len(total):
+        st.caption(f"Showing {len(shown):,} of {len(total):,} rows to keep the chart responsive.")
+
+# Helper for aggregator (pandas built-in names dispatch to its Cython groupby kernels; all skip NaN)
+AGG_NAMES = {"sum": "sum", "mean": "mean", "median": "median", "count": "count"}
+
+def _code_sums(s: pd.Series, vals: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    # Per-category (sum, count) of non-missing vals in one np.bincount pass over the category codes.
+    # Arrays have len(categories) + 1 slots; the last one collects rows with a missing label.
+    k = len(s.cat.categories)
+    codes, v = s.cat.codes.to_numpy().astype(np.intp), vals.to_numpy(dtype=float)
+    codes[codes < 0] = k
+    m = ~np.isnan(v)
+    return np.bincount(codes[m], weights=v[m], minlength=k + 1), np.bincount(codes[m], minlength=k + 1)
+
+def _ratio(num: float, den: float) -> float:
+    return float(num / den) if den else np.nan
+
+def _group_agg(frame: pd.DataFrame, key: str, val: str, how: str) -> pd.DataFrame:
+    # sum/mean/count by a categorical key come straight from the bincount totals;
+    # median and non-categorical keys use pandas' Cython groupby
+    s = frame[key]
+    if how == "median" or not isinstance(s.dtype, pd.CategoricalDtype):
+        return frame.groupby(key, as_index=False, observed=True, sort=False)[val].agg(AGG_NAMES[how])
+    sums, cnts = _code_sums(s, frame[val])
+    sums, cnts = sums[:-1], cnts[:-1]
+    codes = s.cat.codes.to_numpy()
+    seen = np.bincount(codes[codes >= 0], minlength=len(sums)) > 0  # groups with rows, as observed=True
+    out = {"sum": sums, "count": cnts, "mean": sums / np.where(cnts > 0, cnts, np.nan)}[how]
+    return pd.DataFrame({key: s.cat.categories[seen], val: out[seen]})
+
 has_date = len(maybe_date_cols) > 0
 
 if chart_type.startswith("Scatter"):
     if len(num_cols) < 2:
         st.info("Need at least two numeric columns.")
     else:
-        default_x = "bmi" if "bmi" in num_cols else num_cols[0]
-        default_y = "charges" if "charges" in num_cols else (num_cols[1] if len(num_cols) > 1 else num_cols[0])
-        xcol = st.selectbox("X (numeric)", num_cols, index=num_cols.index(default_x) if default_x in num_cols else 0)
-        ycol = st.selectbox("Y (numeric)", num_cols, index=num_cols.index(default_y) if default_y in num_cols else (1 if len(num_cols)>1 else 0))
-        color_by = st.selectbox("Color by (optional)", ["(none)"] + cat_cols, index=(cat_cols.index("smoker")+1) if "smoker" in cat_cols else 0)
+        default_x, default_y = defaults["default_x"], defaults["default_y"]
+        xcol = st.selectbox("X (numeric)", num_cols, index=_idx(num_cols, default_x))
+        ycol = st.selectbox("Y (numeric)", num_cols, index=_idx(num_cols, default_y, 1 if len(num_cols) > 1 else 0))
+        color_by = st.selectbox("Color by (optional)", ["(none)"] + cat_cols, index=_idx(["(none)"] + cat_cols, "smoker"))
         color_arg = None if color_by == "(none)" else color_by
+        # A few meaningful hover fields instead of every column (hover data is serialized per point)
+        hover_cols = [c for c in ("smoker", "region", "age", "children") if c in COLS and c not in (xcol, ycol)]
+        plot_df = _downsample(filt_df, view_key)
         fig = px.scatter(
-            filt_df, x=xcol, y=ycol, color=color_arg,
-            hover_data=[c for c in df.columns if c not in [xcol, ycol]],
-            title=f"{ycol} vs {xcol}"
+            plot_df, x=xcol, y=ycol, color=color_arg,
+            hover_data=hover_cols,
+            title=f"{ycol} vs {xcol}", render_mode=RENDER_MODE
         )
         st.plotly_chart(fig, use_container_width=True)
+        _sample_note(plot_df, filt_df)
 
 elif chart_type.startswith("Bar"):
     if len(cat_cols) == 0 or len(num_cols) == 0:
         st.info("Need at least one categorical and one numeric column.")
     else:
-        bar_cat_default = "region" if "region" in cat_cols else (cat_cols[0])
-        bar_val_default = "charges" if "charges" in num_cols else num_cols[0]
-        bar_cat = st.selectbox("Group by (category)", cat_cols, index=cat_cols.index(bar_cat_default))
-        bar_val = st.selectbox("Measure (numeric)", num_cols, index=num_cols.index(bar_val_default))
-        agg_fn_name = st.selectbox("Aggregation", list(AGGS.keys()), index=1)  # mean
-        g = filt_df.groupby(bar_cat, as_index=False)[bar_val].agg(AGGS[agg_fn_name])
+        bar_cat_default = "region" if "region" in CAT_SET else (cat_cols[0])
+        bar_val_default = "charges" if "charges" in NUM_SET else num_cols[0]
+        bar_cat = st.selectbox("Group by (category)", cat_cols, index=_idx(cat_cols, bar_cat_default))
+        bar_val = st.selectbox("Measure (numeric)", num_cols, index=_idx(num_cols, bar_val_default))
+        agg_fn_name = st.selectbox("Aggregation", list(AGG_NAMES.keys()), index=1)  # mean
+        g = _group_agg(filt_df, bar_cat, bar_val, agg_fn_name)
         g = g.sort_values(bar_val, ascending=False)
         fig = px.bar(g, x=bar_cat, y=bar_val, title=f"{agg_fn_name.title()} of {bar_val} by {bar_cat}")
         st.plotly_chart(fig, use_container_width=True)
@@ -176,22 +434,43 @@ elif chart_type.startswith("Histogram"):
     if len(num_cols) == 0:
         st.info("Need at least one numeric column.")
     else:
-        hist_default = "bmi" if "bmi" in num_cols else num_cols[0]
-        hist_val = st.selectbox("Numeric column", num_cols, index=num_cols.index(hist_default))
+        hist_default = "bmi" if "bmi" in NUM_SET else num_cols[0]
+        hist_val = st.selectbox("Numeric column", num_cols, index=_idx(num_cols, hist_default))
         bins = st.slider("Bins", 5, 100, 30)
-        fig = px.histogram(filt_df, x=hist_val, nbins=bins, title=f"Distribution of {hist_val}")
+        # Bin the finite values in NumPy and send only bin centers/counts, not every row, to the browser
+        vals = filt_df[hist_val].to_numpy(dtype=float)
+        counts, edges = np.histogram(vals[np.isfinite(vals)], bins=bins)
+        fig = go.Figure(go.Bar(x=0.5 * (edges[:-1] + edges[1:]), y=counts, width=np.diff(edges)))
+        fig.update_layout(title=f"Distribution of {hist_val}", xaxis_title=hist_val, yaxis_title="count", bargap=0)
         st.plotly_chart(fig, use_container_width=True)
 
 elif chart_type.startswith("Box"):
     if len(cat_cols) == 0 or len(num_cols) == 0:
         st.info("Need at least one categorical and one numeric column.")
     else:
-        box_cat_default = "smoker" if "smoker" in cat_cols else cat_cols[0]
-        box_val_default = "charges" if "charges" in num_cols else num_cols[0]
-        box_cat = st.selectbox("Category", cat_cols, index=cat_cols.index(box_cat_default))
-        box_val = st.selectbox("Numeric", num_cols, index=num_cols.index(box_val_default))
-        fig = px.box(filt_df, x=box_cat, y=box_val, points="outliers", title=f"{box_val} by {box_cat}")
-        st.plotly_chart(fig, use_container_width=True)
+        box_cat_default = "smoker" if "smoker" in CAT_SET else cat_cols[0]
+        box_val_default = "charges" if "charges" in NUM_SET else num_cols[0]
+        box_cat = st.selectbox("Category", cat_cols, index=_idx(cat_cols, box_cat_default))
+        box_val = st.selectbox("Numeric", num_cols, index=_idx(num_cols, box_val_default))
+        if len(filt_df) <= MAX_POINTS:
+            fig = px.box(filt_df, x=box_cat, y=box_val, points="outliers", title=f"{box_val} by {box_cat}")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            # Large views: draw boxes from precomputed statistics and ship only (capped) outlier points
+            stats, outliers, n_outliers = _box_stats(filt_df, view_key, box_cat, box_val)
+            fig = go.Figure(go.Box(
+                x=stats[box_cat].astype(str), q1=stats["q1"], median=stats["median"], q3=stats["q3"],
+                lowerfence=stats["lowerfence"], upperfence=stats["upperfence"], name=box_val,
+            ))
+            scatter = go.Scattergl if RENDER_MODE == "webgl" else go.Scatter
+            fig.add_trace(scatter(
+                x=outliers[box_cat].astype(str), y=outliers[box_val], mode="markers", name="outliers",
+            ))
+            fig.update_layout(title=f"{box_val} by {box_cat}", xaxis_title=box_cat, yaxis_title=box_val, showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(
+                f"Boxes use all {len(filt_df):,} rows; showing {len(outliers):,} of {n_outliers:,} outliers."
+            )
 
 elif chart_type.startswith("Line"):
     if not len(maybe_date_cols) > 0:
@@ -199,23 +478,54 @@ elif chart_type.startswith("Line"):
     else:
         dcol = st.selectbox("Date column", maybe_date_cols)
         ts_val = st.selectbox("Measure (numeric)", num_cols)
-        fig = px.line(filt_df.sort_values(dcol), x=dcol, y=ts_val, title=f"{ts_val} over time")
+        order = _sort_order(df, digest, dcol)
+        plot_df = _lttb(df.take(order[mask[order]]), view_key, dcol, ts_val)
+        fig = px.line(plot_df, x=dcol, y=ts_val, title=f"{ts_val} over time", render_mode=RENDER_MODE)
         st.plotly_chart(fig, use_container_width=True)
+        _sample_note(plot_df, filt_df)
 
 # -------------------------
 # Insight Cards (tailored to insurance.csv)
 # -------------------------
 
+@st.cache_data(show_spinner=False)
+def _card_stats(_frame: pd.DataFrame, view_key: tuple) -> dict:
+    # Every Insight Card number for one filtered view, computed together and cached by view_key
+    cols, stats = frozenset(_frame.columns), {}
+    if "charges" in cols and "smoker" in cols:
+        smoker = _frame["smoker"]
+        if isinstance(smoker.dtype, pd.CategoricalDtype):
+            # One bincount pass; overall and per-segment means are ratios of the bucket totals
+            sums, cnts = _code_sums(smoker, _frame["charges"])
+            labels = np.append(smoker.cat.categories.astype(str).str.lower(), "")
+            is_yes, is_no = labels == "yes", labels == "no"
+            stats["overall"] = _ratio(sums.sum(), cnts.sum())
+            stats["smokers"] = _ratio(sums[is_yes].sum(), cnts[is_yes].sum())
+            stats["nonsmokers"] = _ratio(sums[is_no].sum(), cnts[is_no].sum())
+        else:
+            charges = _frame["charges"]
+            smokers_mask = _cat_mask(smoker, ["yes"], lower=True)
+            nonsmokers_mask = _cat_mask(smoker, ["no"], lower=True)
+            stats["overall"] = float(np.nanmean(charges)) if len(_frame) else np.nan
+            stats["smokers"] = float(np.nanmean(charges[smokers_mask])) if smokers_mask.any() else np.nan
+            stats["nonsmokers"] = float(np.nanmean(charges[nonsmokers_mask])) if nonsmokers_mask.any() else np.nan
+    if "bmi" in cols:
+        # Drop missing values once; median (partition-based) and obesity count then run on the same buffer
+        bmi = _frame["bmi"].to_numpy(dtype=np.float64, copy=False)
+        bmi = bmi[~np.isnan(bmi)]
+        stats["bmi_median"] = float(np.median(bmi)) if bmi.size else np.nan
+        stats["obese_rate"] = 100 * _ratio(np.count_nonzero(bmi >= 30), bmi.size)
+    if "region" in cols and "charges" in cols:
+        stats["region_means"] = _group_agg(_frame, "region", "charges", "mean").sort_values("charges", ascending=False)
+    return stats
+
 st.header("4) Insight Cards")
 colA, colB, colC = st.columns(3)
+cards = _card_stats(filt_df, view_key)
 
 # Overall vs smoker segments (if available)
-if "charges" in filt_df.columns and "smoker" in filt_df.columns:
-    overall = float(np.nanmean(filt_df["charges"])) if len(filt_df) else np.nan
-    smokers_mask = filt_df["smoker"].astype(str).str.lower() == "yes"
-    nonsmokers_mask = filt_df["smoker"].astype(str).str.lower() == "no"
-    smokers = float(np.nanmean(filt_df.loc[smokers_mask, "charges"])) if smokers_mask.any() else np.nan
-    nonsmokers = float(np.nanmean(filt_df.loc[nonsmokers_mask, "charges"])) if nonsmokers_mask.any() else np.nan
+if "overall" in cards:
+    overall, smokers, nonsmokers = cards["overall"], cards["smokers"], cards["nonsmokers"]
     with colA:
         st.metric("Avg charges (all)", f"${overall:,.0f}")
     with colB:
@@ -234,21 +544,23 @@ else:
 
 # Secondary insights (BMI, region breakdown)
 colD, colE = st.columns(2)
-if "bmi" in filt_df.columns:
-    bmi_median = float(np.nanmedian(filt_df["bmi"]))
-    obese_rate = float(np.mean(filt_df["bmi"] >= 30) * 100)
+if "bmi_median" in cards:
     with colD:
-        st.metric("Median BMI", f"{bmi_median:.1f}")
+        st.metric("Median BMI", f"{cards['bmi_median']:.1f}")
     with colE:
-        st.metric("Obesity rate (BMI≥30)", f"{obese_rate:.1f}%")
+        st.metric("Obesity rate (BMI≥30)", f"{cards['obese_rate']:.1f}%")
 
-if "region" in filt_df.columns and "charges" in filt_df.columns:
-    g = filt_df.groupby("region", as_index=False)["charges"].mean().sort_values("charges", ascending=False)
-    fig = px.bar(g, x="region", y="charges", title="Mean charges by region")
+if "region_means" in cards:
+    fig = px.bar(cards["region_means"], x="region", y="charges", title="Mean charges by region")
     st.plotly_chart(fig, use_container_width=True)
 
-with st.expander("Show descriptive statistics"):
-    st.dataframe(filt_df.describe(include="all"), use_container_width=True)
+@st.cache_data(show_spinner=False)
+def _describe(_frame: pd.DataFrame, view_key: tuple) -> pd.DataFrame:
+    return _frame.describe(include="all")
+
+# Streamlit runs expander bodies even when collapsed, so gate the work behind a checkbox
+if st.checkbox("Show descriptive statistics"):
+    st.dataframe(_describe(filt_df, view_key), use_container_width=True)
 
 # -------------------------
 # Reflection template